@@ -101,9 +101,28 @@ class Bot:
         self.server = None
         self.socket = None
         self.handlers = collections.defaultdict(list)
-        for attr in dir(self):
-            if attr.startswith('_on_'):
-                self.on(attr[4:], getattr(self, attr))
+        for attr in self._get_event_handler_names():
+            self.on(attr[4:], getattr(self, attr))
+
+    @classmethod
+    def _get_event_handler_names(cls):
+        """Get names of default event handler methods.
+
+        The list is built once per class and cached in the class dict,
+        so subclasses get their own list.
+
+        Returns
+        -------
+        `tuple` of `str`
+        """
+        names = cls.__dict__.get('_event_handler_names')
+        if names is None:
+            names = tuple(
+                attr for attr in dir(cls)
+                if attr.startswith('_on_')
+            )
+            cls._event_handler_names = names
+        return names
 
     def _on_rank(self, _, data):
         self.user.rank = data
@@ -673,11 +692,14 @@ class Bot:
                 )
             return False
 
-        action = 'playlist' if self.channel.playlist.locked else 'oplaylist'
+        if self.channel.playlist.locked:
+            add_action, next_action = 'playlistadd', 'playlistnext'
+        else:
+            add_action, next_action = 'oplaylistadd', 'oplaylistnext'
         self.logger.info('add media %s', link)
-        self.channel.check_permission(action + 'add', self.user)
+        self.channel.check_permission(add_action, self.user)
         if not append:
-            self.channel.check_permission(action + 'next', self.user)
+            self.channel.check_permission(next_action, self.user)
         if not temp:
             self.channel.check_permission('addnontemp', self.user)
 
@@ -1,3 +1,4 @@
+import sys
 import logging
 
 from .playlist import Playlist
@@ -20,6 +21,7 @@ class Channel:
     js: `str`
     emotes: `list` of `dict`
     permissions : `dict` of (`str`, `float`)
+        Minimum rank for each action.
     options : `dict`
     userlist : `cytube_bot.user.UserList`
     playlist : `cytube_bot.playlist.Playlist`
@@ -49,6 +51,17 @@ class Channel:
 
     __repr__ = __str__
 
+    @property
+    def permissions(self):
+        return self._permissions
+
+    @permissions.setter
+    def permissions(self, permissions):
+        self._permissions = {
+            sys.intern(action): float(rank)
+            for action, rank in permissions.items()
+        }
+
     def check_permission(self, action, user, throw=True):
         """Check if user has permission.
 
@@ -73,20 +86,50 @@ class Channel:
         ValueError
             If permission does not exist.
         """
-        try:
-            min_rank = self.permissions[action]
-            if user.rank + self.RANK_PRECISION < min_rank:
-                if throw:
-                    raise ChannelPermissionError(
-                        '"%s": permission denied (%s rank %.2f < %.2f)'
-                        % (action, user.name, user.rank, min_rank)
-                    )
-                return False
-            return True
-        except KeyError:
+        min_rank = self._permissions.get(action)
+        if min_rank is None:
             raise ValueError('unknown action "%s"' % action)
+        if user.rank + self.RANK_PRECISION < min_rank:
+            if throw:
+                raise ChannelPermissionError(
+                    '"%s": permission denied (%s rank %.2f < %.2f)'
+                    % (action, user.name, user.rank, min_rank)
+                )
+            return False
+        return True
 
     def has_permission(self, action, user):
         """check_permission(action, user, False)
         """
         return self.check_permission(action, user, False)
+
+    def has_permissions(self, actions, user):
+        """Check if user has several permissions.
+
+        Parameters
+        ----------
+        actions : `str` or iterable of `str`
+            Permissions to check.
+        user : `cytube_bot.user.User`
+            User.
+
+        Returns
+        -------
+        `dict` of (`str`, `bool`)
+            `True` for each permission user has.
+
+        Raises
+        ------
+        ValueError
+            If permission does not exist.
+        """
+        if isinstance(actions, str):
+            actions = (actions,)
+        rank = user.rank + self.RANK_PRECISION
+        res = {}
+        for action in actions:
+            min_rank = self._permissions.get(action)
+            if min_rank is None:
+                raise ValueError('unknown action "%s"' % action)
+            res[action] = rank >= min_rank
+        return res
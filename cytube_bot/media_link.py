@@ -1,55 +1,187 @@
 import os
 import re
 import logging
-from urllib.parse import urlparse, parse_qsl
+import functools
+from urllib.parse import urlsplit, parse_qsl
+
+
+URL_HOST = re.compile(r'^(?:\(\?:([\w|-]+)\))?((?:[\w-]|\\\.)+)/')
+
+
+def url_hosts(expr):
+    r"""Get host names a URL regexp starts with.
+
+    Parameters
+    ----------
+    expr : `str`
+        URL regexp.
+
+    Returns
+    -------
+    `tuple` of `str`
+        Host names (empty if the regexp does not start with a host name).
+
+    Examples
+    --------
+    >>> url_hosts(r'youtu\.be/([^\?&#]+)')
+    ('youtu.be',)
+    >>> url_hosts(r'(?:hitbox|smashcast)\.tv/([^\?&#]+)')
+    ('hitbox.tv', 'smashcast.tv')
+    >>> url_hosts(r'(?m)^(.*\.m3u8)')
+    ()
+    """
+    match = URL_HOST.match(expr)
+    if match is None:
+        return ()
+    prefixes, host = match.groups()
+    host = host.replace('\\.', '.')
+    if prefixes is None:
+        return (host,)
+    return tuple(prefix + host for prefix in prefixes.split('|'))
+
+
+def host_to_link(url_to_link):
+    """Group URL regexps by host name.
+
+    Parameters
+    ----------
+    url_to_link : `list` of (`re.Pattern`, `str`, `str`)
+        (compiled url regexp, type format string, id format string)
+
+    Returns
+    -------
+    `dict` of (`str`, `list` of (`re.Pattern`, `str`, `str`))
+        For every host name (with and without "www."),
+        `url_to_link` items that can match a URL with that host,
+        in original order.
+    """
+    link_hosts = [url_hosts(link[0].pattern) for link in url_to_link]
+    hosts = set()
+    for hosts_ in link_hosts:
+        for host in hosts_:
+            hosts.add(host)
+            hosts.add('www.' + host)
+    return {
+        host: [
+            link
+            for link, hosts_ in zip(url_to_link, link_hosts)
+            if not hosts_ or any(host.endswith(host_) for host_ in hosts_)
+        ]
+        for host in hosts
+    }
+
+
+def compile_url_to_link(url_to_link):
+    """Compile URL regexps and group them by host name.
+
+    Parameters
+    ----------
+    url_to_link : `list` of (`str` or `re.Pattern`, `str`, `str`)
+        (url regexp, type format string, id format string)
+
+    Returns
+    -------
+    (`list` of (`re.Pattern`, `str`, `str`), `dict`)
+        `url_to_link` with compiled regexps and its `host_to_link`.
+    """
+    url_to_link = [
+        (re.compile(expr), type_, id_)
+        for expr, type_, id_ in url_to_link
+    ]
+    return url_to_link, host_to_link(url_to_link)
 
 
 class MediaLink:
     """Media link.
 
+    `from_url` results are cached per class. After changing
+    `URL_TO_LINK`, `FAST_URL_TO_LINK`, `PREFIX_ID_END` or `FILE_TYPES`
+    of a class that has parsed URLs, call
+    `MediaLink._parse_url.cache_clear()`.
+
     Attributes
     ----------
     type : `str`
         Link type.
     id : `str`
         Link ID.
+    PREFIX_ID_END : `dict` of (`str`, `str`)
+        (type, characters ending link ID) for "xx:id" links,
+        parsed without `URL_TO_LINK` regexps by classes that
+        do not override `URL_TO_LINK`.
+        Other types end link ID at any of `PREFIX_ID_END[None]`.
     FILE_TYPES : `list` of `str`
         Supported raw file extensions.
-    URL_TO_LINK : `list` of (`str`, `str`, `str`)
+        Converted to a `frozenset` on first use.
+    URL_TO_LINK : `list` of (`str` or `re.Pattern`, `str`, `str`)
         (url regexp, type format string, id format string)
+        Compiled and grouped by URL host with `compile_url_to_link`
+        on first use.
+        A URL with a known host is only matched against regexps
+        for that host and regexps without a host.
+    FAST_URL_TO_LINK : `list` of (`re.Pattern`, `str`)
+        (compiled url regexp, type) for common canonical URLs,
+        checked before `URL_TO_LINK`. Link ID is the first group.
+        A match must give the same link as the built-in `URL_TO_LINK`,
+        so it is only used by classes that do not override
+        `URL_TO_LINK`, like `PREFIX_ID_END`. Override `URL_TO_LINK`
+        in a subclass rather than changing the built-in list in place.
     LINK_TO_URL : `dict` of (`str`, `str`)
         (type, url format string)
     """
 
+    __slots__ = ('type', 'id')
+
     logger = logging.getLogger(__name__)
 
+    _unknown_types = set()
+
     URL_TO_LINK = [
-        (r'youtube\.com/watch\?([^#]+)', 'yt', '{v}'),
-        (r'youtu\.be/([^\?&#]+)', 'yt', '{0}'),
-        (r'youtube\.com/playlist\?([^#]+)', 'yp', '{list}'),
-        (r'clips\.twitch\.tv/([A-Za-z]+)', 'tc', '{0}'),
-        (r'twitch\.tv/(?:.*?)/([cv])/(\d+)', 'tv', '{0}{1}'),
-        (r'twitch\.tv/videos/(\d+)', 'tv', 'v{0}'),
-        (r'twitch\.tv/([\w-]+)', 'tw', '{0}'),
-        (r'livestream\.com/([^\?&#]+)', 'li', '{0}'),
-        (r'ustream\.tv/([^\?&#]+)', 'us', '{0}'),
-        (r'(?:hitbox|smashcast)\.tv/([^\?&#]+)', 'hb', '{0}'),
-        (r'vimeo\.com/([^\?&#]+)', 'vi', '{0}'),
-        (r'dailymotion\.com/video/([^\?&#_]+)', 'dm', '{0}'),
-        (r'imgur\.com/a/([^\?&#]+)', 'im', '{0}'),
-        (r'soundcloud\.com/([^\?&#]+)', 'sc', '{url}'),
-        (r'(?:docs|drive)\.google\.com/file/d/([a-zA-Z0-9_-]+)', 'gd', '{0}'),
-        (r'drive\.google\.com/open\?id=([a-zA-Z0-9_-]+)', 'gd', '{0}'),
-        (r'vid\.me/embedded/([\w-]+)', 'vm', '{0}'),
-        (r'vid\.me/([\w-]+)', 'vm', '{0}'),
-        (r'(.*\.m3u8)', 'hl', '{url}'),
-        (r'streamable\.com/([\w-]+)', 'sb', '{0}'),
-        (r'^dm:([^\?&#_]+)', 'dm', '{0}'),
-        (r'^fi:(.*)', 'fi', '{0}'),
-        (r'^cm:(.*)', 'cm', '{0}'),
-        (r'^([a-z]{2}):([^\?&#]+)', '{0}', '{1}')
+        (re.compile(expr), type_, id_)
+        for expr, type_, id_ in [
+            (r'youtube\.com/watch\?([^#]+)', 'yt', '{v}'),
+            (r'youtu\.be/([^\?&#]+)', 'yt', '{0}'),
+            (r'youtube\.com/playlist\?([^#]+)', 'yp', '{list}'),
+            (r'clips\.twitch\.tv/([A-Za-z]+)', 'tc', '{0}'),
+            (r'twitch\.tv/(?:.*?)/([cv])/(\d+)', 'tv', '{0}{1}'),
+            (r'twitch\.tv/videos/(\d+)', 'tv', 'v{0}'),
+            (r'twitch\.tv/([\w-]+)', 'tw', '{0}'),
+            (r'livestream\.com/([^\?&#]+)', 'li', '{0}'),
+            (r'ustream\.tv/([^\?&#]+)', 'us', '{0}'),
+            (r'(?:hitbox|smashcast)\.tv/([^\?&#]+)', 'hb', '{0}'),
+            (r'vimeo\.com/([^\?&#]+)', 'vi', '{0}'),
+            (r'dailymotion\.com/video/([^\?&#_]+)', 'dm', '{0}'),
+            (r'imgur\.com/a/([^\?&#]+)', 'im', '{0}'),
+            (r'soundcloud\.com/([^\?&#]+)', 'sc', '{url}'),
+            (r'(?:docs|drive)\.google\.com/file/d/([a-zA-Z0-9_-]+)',
+             'gd', '{0}'),
+            (r'drive\.google\.com/open\?id=([a-zA-Z0-9_-]+)', 'gd', '{0}'),
+            (r'vid\.me/embedded/([\w-]+)', 'vm', '{0}'),
+            (r'vid\.me/([\w-]+)', 'vm', '{0}'),
+            (r'(?m)^(.*\.m3u8)', 'hl', '{url}'),
+            (r'streamable\.com/([\w-]+)', 'sb', '{0}'),
+            (r'^dm:([^\?&#_]+)', 'dm', '{0}'),
+            (r'^fi:(.*)', 'fi', '{0}'),
+            (r'^cm:(.*)', 'cm', '{0}'),
+            (r'^([a-z]{2}):([^\?&#]+)', '{0}', '{1}')
+        ]
+    ]
+
+    FAST_URL_TO_LINK = [
+        (re.compile(r'^https?://(?:www\.)?youtube\.com/watch\?v=([\w-]+)$'),
+         'yt'),
+        (re.compile(r'^https?://youtu\.be/([\w-]+)$'), 'yt'),
+        (re.compile(r'^https?://(?:www\.)?twitch\.tv/([\w-]+)$'), 'tw'),
+        (re.compile(r'^https?://(?:www\.)?vimeo\.com/(\d+)$'), 'vi')
     ]
 
+    PREFIX_ID_END = {
+        'dm': '?&#_',
+        'fi': '\n',
+        'cm': '\n',
+        None: '?&#'
+    }
+
     FILE_TYPES = [
         '.mp4', '.flv', '.webm', '.ogg',
         '.ogv', '.mp3', '.mov', '.m4a'
@@ -97,14 +229,18 @@ class MediaLink:
     @property
     def url(self):
         """Media URL.
+
+        Unknown media types are logged once per type.
         """
         try:
             url = self.LINK_TO_URL[self.type]
         except KeyError:
-            self.logger.warning(
-                'unknown media type "%s" (id="%s")',
-                self.type, self.id
-            )
+            if self.type not in self._unknown_types:
+                self._unknown_types.add(self.type)
+                self.logger.warning(
+                    'unknown media type "%s" (id="%s")',
+                    self.type, self.id
+                )
             return '{0}:{1}'.format(self.type, self.id)
         return url.format(self.id)
 
@@ -121,34 +257,136 @@ class MediaLink:
         -------
         MediaLink
 
+        Raises
+        ------
+        ValueError
+            If media URL is not supported.
+        """
+        return cls(*cls._parse_url(url))
+
+    @classmethod
+    def from_urls(cls, urls):
+        """Create media links from URLs.
+
+        Parameters
+        ----------
+        urls : iterable of `str`
+            Media URLs.
+
+        Returns
+        -------
+        `list` of `MediaLink`
+
+        Raises
+        ------
+        ValueError
+            If a media URL is not supported.
+        """
+        parse_url = cls._parse_url
+        return [cls(*parse_url(url)) for url in urls]
+
+    @classmethod
+    def _parse_prefix(cls, url):
+        """Parse "xx:id" media link without URL regexps.
+
+        Only URLs without "." are parsed, other built-in `URL_TO_LINK`
+        regexps can not match them.
+
+        Parameters
+        ----------
+        url : `str`
+            Media URL.
+
+        Returns
+        -------
+        (`str`, `str`) or `None`
+            Link type and ID, or `None` if `url` should be parsed
+            with `URL_TO_LINK`.
+        """
+        type_, sep, id_ = url.partition(':')
+        if (
+            not sep
+            or len(type_) != 2
+            or '.' in url
+            or not all('a' <= char <= 'z' for char in type_)
+        ):
+            return None
+        id_end = cls.PREFIX_ID_END.get(type_, cls.PREFIX_ID_END[None])
+        for i, char in enumerate(id_):
+            if char in id_end:
+                id_ = id_[:i]
+                break
+        if not id_ and type_ not in ('fi', 'cm'):
+            return None
+        return type_, id_
+
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_url(cls, url):
+        """Parse media URL.
+
+        Results are cached per class and URL, links are created
+        by `from_url`. The cache is not invalidated when class tables
+        change; clear it with `MediaLink._parse_url.cache_clear()`.
+
+        Parameters
+        ----------
+        url : `str`
+            Media URL.
+
+        Returns
+        -------
+        (`str`, `str`)
+            Link type and ID.
+
         Raises
         ------
         ValueError
             If media URL is not supported.
         """
         url = url.strip().replace('feature=player_embedded&', '')
-        parsed_url = urlparse(url)
+
+        if cls.URL_TO_LINK is MediaLink.URL_TO_LINK:
+            link = cls._parse_prefix(url)
+            if link is not None:
+                return link
+            for expr, type_ in cls.FAST_URL_TO_LINK:
+                match = expr.match(url)
+                if match is not None:
+                    return type_, match.group(1)
+
+        parsed_url = urlsplit(url)
 
         if parsed_url.scheme == 'rtmp':
-            return cls('rt', url)
+            return 'rt', url
 
-        for expr, type_, id_ in cls.URL_TO_LINK:
-            match = re.search(expr, url)
+        url_to_link, host_table = cls._get_table(
+            'URL_TO_LINK',
+            compile_url_to_link
+        )
+        for expr, type_, id_ in host_table.get(parsed_url.netloc,
+                                               url_to_link):
+            match = expr.search(url)
             if match is not None:
                 args = match.groups()
                 kwargs = dict(parse_qsl(parsed_url.query))
                 kwargs['url'] = url
-                return cls(
+                return (
                     type_.format(*args, **kwargs),
                     id_.format(*args, **kwargs)
                 )
 
         if parsed_url.scheme == 'https':
-            _, ext = os.path.splitext(parsed_url.path)
+            path = parsed_url.path
+            # drop ";params" from the last segment, like urlparse
+            params = path.find(';', path.rfind('/') + 1)
+            if params >= 0:
+                path = path[:params]
+            _, ext = os.path.splitext(path)
             if ext == '.json':
-                return cls('cm', url)
-            if ext in cls.FILE_TYPES:
-                return cls('fi', url)
+                return 'cm', url
+            if ext in cls._get_table('FILE_TYPES', frozenset):
+                return 'fi', url
             raise ValueError(
                 'The file you are attempting to queue does not match the'
                 ' supported file extensions %s.'
@@ -159,3 +397,32 @@ class MediaLink:
 
         raise ValueError('Raw files must begin with "https".'
                          ' Plain http is not supported.')
+
+    @classmethod
+    def _get_table(cls, attr, build):
+        """Get lookup table built from a class attribute.
+
+        Tables are built on first use and kept in the class dict,
+        so subclasses overriding the attribute get their own tables.
+        A table is rebuilt if the attribute has changed.
+
+        Parameters
+        ----------
+        attr : `str`
+            Class attribute name (one table per attribute).
+        build : `function` (value)
+            Table constructor.
+
+        Returns
+        -------
+        `object`
+            Table built from attribute value.
+        """
+        value = list(getattr(cls, attr))
+        tables = cls.__dict__.get('_tables')
+        if tables is None:
+            tables = {}
+            cls._tables = tables
+        if attr not in tables or tables[attr][0] != value:
+            tables[attr] = (value, build(value))
+        return tables[attr][1]
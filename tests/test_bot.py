@@ -0,0 +1,27 @@
+import asyncio
+import pytest
+
+from cytube_bot.bot import Bot
+
+
+class SubBot(Bot):
+    def _on_foo(self, _, data):
+        pass
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_event_handler_names(loop):
+    sub = SubBot('localhost', 'channel', loop=loop)
+    bot = Bot('localhost', 'channel', loop=loop)
+    assert 'foo' in sub.handlers
+    assert 'foo' not in bot.handlers
+    assert 'setMotd' in sub.handlers
+    assert 'setMotd' in bot.handlers
+    assert '_on_foo' in SubBot._get_event_handler_names()
+    assert '_on_foo' not in Bot._get_event_handler_names()
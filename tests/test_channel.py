@@ -0,0 +1,64 @@
+import pytest
+
+from cytube_bot.channel import Channel
+from cytube_bot.user import User
+from cytube_bot.error import ChannelPermissionError
+
+
+PERMISSIONS = {
+    'chat': 0,
+    'kick': 1.5,
+    'chatclear': 2
+}
+
+
+@pytest.fixture
+def channel():
+    channel = Channel('test')
+    channel.permissions = PERMISSIONS
+    return channel
+
+
+def test_permissions(channel):
+    assert channel.permissions == PERMISSIONS
+    assert all(isinstance(rank, float)
+               for rank in channel.permissions.values())
+
+
+@pytest.mark.parametrize('action,rank,res', [
+    ('chat', -1, False),
+    ('chat', 0, True),
+    ('kick', 1, False),
+    ('kick', 1.49995, True),
+    ('kick', 2, True),
+    ('chatclear', 1.9998, False),
+    ('chatclear', 3, True)
+])
+def test_check_permission(channel, action, rank, res):
+    user = User('user', rank=rank)
+    assert channel.has_permission(action, user) is res
+    if res:
+        assert channel.check_permission(action, user) is True
+    else:
+        with pytest.raises(ChannelPermissionError):
+            channel.check_permission(action, user)
+
+
+def test_check_permission_unknown_action(channel):
+    with pytest.raises(ValueError):
+        channel.check_permission('unknown', User('user', rank=5))
+
+
+@pytest.mark.parametrize('rank', [-1, 0, 1, 1.49995, 2])
+def test_has_permissions(channel, rank):
+    user = User('user', rank=rank)
+    res = channel.has_permissions(list(PERMISSIONS), user)
+    assert res == {
+        action: channel.has_permission(action, user)
+        for action in PERMISSIONS
+    }
+    assert channel.has_permissions('chat', user) == {'chat': rank >= 0}
+    assert channel.has_permissions(iter(PERMISSIONS), user) == res
+    assert channel.has_permissions(set(PERMISSIONS), user) == res
+    with pytest.raises(ValueError):
+        channel.has_permissions(['chat', 'unknown'], user)
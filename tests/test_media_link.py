@@ -0,0 +1,294 @@
+import re
+import pytest
+
+from cytube_bot.media_link import (
+    MediaLink, url_hosts, host_to_link, compile_url_to_link
+)
+
+
+@pytest.mark.parametrize('url,type_,id_', [
+    ('https://youtube.com/watch?v=dQw4w9WgXcQ', 'yt', 'dQw4w9WgXcQ'),
+    ('https://www.youtube.com/watch?t=10&v=dQw4w9WgXcQ#t',
+     'yt', 'dQw4w9WgXcQ'),
+    ('http://youtube.com/watch?feature=player_embedded&v=abc', 'yt', 'abc'),
+    ('  https://youtu.be/dQw4w9WgXcQ?t=3  ', 'yt', 'dQw4w9WgXcQ'),
+    ('https://m.youtube.com/watch?v=abc', 'yt', 'abc'),
+    ('https://youtube.com/playlist?list=PL123', 'yp', 'PL123'),
+    ('https://clips.twitch.tv/SomeClip', 'tc', 'SomeClip'),
+    ('https://clips.twitch.tv/123', 'tw', '123'),
+    ('https://twitch.tv/chan/v/1234', 'tv', 'v1234'),
+    ('https://twitch.tv/chan/c/99', 'tv', 'c99'),
+    ('https://twitch.tv/videos/5555', 'tv', 'v5555'),
+    ('https://www.twitch.tv/some_chan', 'tw', 'some_chan'),
+    ('https://livestream.com/foo/bar', 'li', 'foo/bar'),
+    ('https://ustream.tv/channel/x', 'us', 'channel/x'),
+    ('https://hitbox.tv/foo', 'hb', 'foo'),
+    ('https://smashcast.tv/foo', 'hb', 'foo'),
+    ('https://vimeo.com/12345', 'vi', '12345'),
+    ('https://player.vimeo.com/video/1', 'vi', 'video/1'),
+    ('https://dailymotion.com/video/x2abc_title', 'dm', 'x2abc'),
+    ('https://imgur.com/a/abc', 'im', 'abc'),
+    ('https://soundcloud.com/artist/track',
+     'sc', 'https://soundcloud.com/artist/track'),
+    ('https://docs.google.com/file/d/ABC_def-1/view', 'gd', 'ABC_def-1'),
+    ('https://drive.google.com/open?id=XYZ', 'gd', 'XYZ'),
+    ('https://vid.me/embedded/abc', 'vm', 'abc'),
+    ('https://vid.me/abc', 'vm', 'abc'),
+    ('https://example.com/live.m3u8', 'hl', 'https://example.com/live.m3u8'),
+    ('https://streamable.com/a.m3u8', 'hl', 'https://streamable.com/a.m3u8'),
+    ('https://streamable.com/abcd', 'sb', 'abcd'),
+    ('dm:x123_title', 'dm', 'x123'),
+    ('fi:https://a.com/b.mp4', 'fi', 'https://a.com/b.mp4'),
+    ('cm:https://a.com/b.json', 'cm', 'https://a.com/b.json'),
+    ('yt:abc', 'yt', 'abc'),
+    ('xx:abc?d', 'xx', 'abc'),
+    ('rtmp://server/app/stream', 'rt', 'rtmp://server/app/stream'),
+    ('https://example.com/video.mp4', 'fi', 'https://example.com/video.mp4'),
+    ('https://example.com/a.webm?x=1', 'fi', 'https://example.com/a.webm?x=1'),
+    ('https://example.com/a.json', 'cm', 'https://example.com/a.json'),
+    ('https://example.com/a.mp4;x', 'fi', 'https://example.com/a.mp4;x'),
+    ('https://example.com/a;x/b.mp4', 'fi', 'https://example.com/a;x/b.mp4')
+])
+def test_from_url(url, type_, id_):
+    assert MediaLink.from_url(url) == MediaLink(type_, id_)
+
+
+@pytest.mark.parametrize('url', [
+    '',
+    'Yt:abc',
+    'http://example.com/video.mp4',
+    'https://example.com/video.MP4',
+    'https://example.com/a.txt',
+    'https://example.com/noext',
+    'https://vimeo.com/'
+])
+def test_from_url_error(url):
+    with pytest.raises(ValueError):
+        MediaLink.from_url(url)
+
+
+def test_from_urls():
+    urls = [
+        'https://youtu.be/abc',
+        'dm:x123',
+        'https://example.com/a.mp4',
+        'https://youtu.be/abc'
+    ]
+    assert MediaLink.from_urls(iter(urls)) == [
+        MediaLink.from_url(url) for url in urls
+    ]
+    assert MediaLink.from_urls([]) == []
+    with pytest.raises(ValueError):
+        MediaLink.from_urls(['https://youtu.be/abc', 'https://vimeo.com/'])
+
+
+@pytest.mark.parametrize('link,url', [
+    (MediaLink('yt', 'abc'), 'https://youtube.com/watch?v=abc'),
+    (MediaLink('us', 'x'), 'https://www.ustream.tv/x'),
+    (MediaLink('fi', 'https://a.com/b.mp4'), 'https://a.com/b.mp4'),
+    (MediaLink('tv', 'v1'), 'tv:v1')
+])
+def test_url(link, url):
+    assert link.url == url
+
+
+@pytest.mark.parametrize('expr,res', [
+    (r'youtu\.be/([^\?&#]+)', ('youtu.be',)),
+    (r'clips\.twitch\.tv/([A-Za-z]+)', ('clips.twitch.tv',)),
+    (r'(?:hitbox|smashcast)\.tv/([^\?&#]+)', ('hitbox.tv', 'smashcast.tv')),
+    (r'(?m)^(.*\.m3u8)', ()),
+    (r'^dm:([^\?&#_]+)', ())
+])
+def test_url_hosts(expr, res):
+    assert url_hosts(expr) == res
+
+
+def test_url_to_link():
+    pattern = type(re.compile(''))
+    assert all(isinstance(expr, pattern)
+               for expr, _, _ in MediaLink.URL_TO_LINK)
+
+
+def test_host_to_link():
+    table = host_to_link(MediaLink.URL_TO_LINK)
+    for host, links in table.items():
+        assert all(link in MediaLink.URL_TO_LINK for link in links)
+        assert links == sorted(links, key=MediaLink.URL_TO_LINK.index)
+    assert compile_url_to_link(MediaLink.URL_TO_LINK) == (
+        MediaLink.URL_TO_LINK, table
+    )
+
+
+def test_get_table_tuple():
+    class SubLink(MediaLink):
+        URL_TO_LINK = tuple(MediaLink.URL_TO_LINK)
+
+    table = SubLink._get_table('URL_TO_LINK', compile_url_to_link)
+    assert SubLink._get_table('URL_TO_LINK', compile_url_to_link) is table
+    assert (MediaLink._get_table('URL_TO_LINK', compile_url_to_link)
+            is not table)
+
+
+@pytest.mark.parametrize('url,link', [
+    ('https://vid.me/v//file/d/hitbox.tv/c/', MediaLink('vm', 'v')),
+    ('https://youtube.com/a/.mp4vid.me/open?id=', None),
+    ('https://twitch.tv/foo?ref=youtu.be/x', MediaLink('tw', 'foo')),
+    ('https://example.com/twitch.tv/foo', MediaLink('tw', 'foo'))
+])
+def test_from_url_other_host(url, link):
+    if link is None:
+        with pytest.raises(ValueError):
+            MediaLink.from_url(url)
+    else:
+        assert MediaLink.from_url(url) == link
+
+
+def test_url_to_link_subclass():
+    class SubLink(MediaLink):
+        URL_TO_LINK = [
+            (r'youtube\.com/custom/(\w+)', 'yt', '{0}')
+        ] + MediaLink.URL_TO_LINK
+
+    url = 'https://youtube.com/custom/abc'
+    with pytest.raises(ValueError):
+        MediaLink.from_url(url)
+    assert SubLink.from_url(url) == SubLink('yt', 'abc')
+    assert SubLink.from_url('https://youtu.be/abc') == SubLink('yt', 'abc')
+
+
+def test_url_to_link_str():
+    class SubLink(MediaLink):
+        URL_TO_LINK = MediaLink.URL_TO_LINK + [
+            (r'example\.com/v/(\w+)', 'fi', 'https://example.com/{0}.mp4')
+        ]
+
+    assert SubLink.from_url('https://example.com/v/abc') == SubLink(
+        'fi', 'https://example.com/abc.mp4'
+    )
+    assert SubLink.from_url('https://youtu.be/abc') == SubLink('yt', 'abc')
+
+
+def test_file_types_subclass():
+    class SubLink(MediaLink):
+        FILE_TYPES = ('.mp4', '.mkv')
+
+    url = 'https://example.com/a.mkv'
+    with pytest.raises(ValueError):
+        MediaLink.from_url(url)
+    assert SubLink.from_url(url) == SubLink('fi', url)
+    with pytest.raises(ValueError):
+        SubLink.from_url('https://example.com/a.webm')
+    table = SubLink._get_table('FILE_TYPES', frozenset)
+    assert table == frozenset(SubLink.FILE_TYPES)
+    assert SubLink._get_table('FILE_TYPES', frozenset) is table
+
+
+def test_from_url_cached():
+    url = 'https://youtube.com/watch?v=cached'
+    link = MediaLink.from_url(url)
+    link.id = 'changed'
+    assert MediaLink.from_url(url) == MediaLink('yt', 'cached')
+    assert MediaLink.from_url(url) is not MediaLink.from_url(url)
+
+
+def test_from_url_cache_clear():
+    class SubLink(MediaLink):
+        URL_TO_LINK = list(MediaLink.URL_TO_LINK)
+
+    url = 'https://example.com/v/abc.mp4'
+    assert SubLink.from_url(url) == SubLink('fi', url)
+    SubLink.URL_TO_LINK.insert(0, (r'example\.com/v/(\w+)', 'yt', '{0}'))
+    assert SubLink.from_url(url) == SubLink('fi', url)
+    MediaLink._parse_url.cache_clear()
+    assert SubLink.from_url(url) == SubLink('yt', 'abc')
+
+
+@pytest.mark.parametrize('url', [
+    'https://youtube.com/watch?v=dQw4w9WgXcQ',
+    'http://www.youtube.com/watch?v=a-b_c',
+    'https://youtu.be/dQw4w9WgXcQ',
+    'https://twitch.tv/videos',
+    'https://www.twitch.tv/some_chan',
+    'https://vimeo.com/12345'
+])
+def test_fast_url_to_link(monkeypatch, url):
+    link = MediaLink.from_url(url)
+    MediaLink._parse_url.cache_clear()
+    monkeypatch.setattr(MediaLink, 'FAST_URL_TO_LINK', [])
+    assert MediaLink.from_url(url) == link
+    MediaLink._parse_url.cache_clear()
+
+
+def test_fast_url_to_link_subclass():
+    class SubLink(MediaLink):
+        URL_TO_LINK = [
+            (r'youtu\.be/([^\?&#]+)', 'zz', '{0}')
+        ] + MediaLink.URL_TO_LINK
+
+    url = 'https://youtu.be/abc'
+    assert MediaLink.from_url(url) == MediaLink('yt', 'abc')
+    assert SubLink.from_url(url) == SubLink('zz', 'abc')
+
+
+@pytest.mark.parametrize('url', [
+    'dm:x123',
+    'dm:x_y',
+    'dm:_x',
+    'fi:',
+    'fi:a?b#c',
+    'cm:a\nb',
+    'xx:something',
+    'ab:c?d',
+    'xx:?',
+    'Yt:abc',
+    'yt:a.b',
+    'abc:d'
+])
+def test_parse_prefix(monkeypatch, url):
+    MediaLink._parse_url.cache_clear()
+    try:
+        link = MediaLink.from_url(url)
+    except ValueError:
+        link = None
+    MediaLink._parse_url.cache_clear()
+    monkeypatch.setattr(MediaLink, '_parse_prefix',
+                        classmethod(lambda cls, url: None))
+    if link is None:
+        with pytest.raises(ValueError):
+            MediaLink.from_url(url)
+    else:
+        assert MediaLink.from_url(url) == link
+    MediaLink._parse_url.cache_clear()
+
+
+def test_parse_prefix_subclass():
+    class SubLink(MediaLink):
+        URL_TO_LINK = [(r'^yt:(\w+)', 'zz', '{0}')] + [
+            link for link in MediaLink.URL_TO_LINK
+            if link[0].pattern != r'^([a-z]{2}):([^\?&#]+)'
+        ]
+
+    assert MediaLink.from_url('qq:abc') == MediaLink('qq', 'abc')
+    with pytest.raises(ValueError):
+        SubLink.from_url('qq:abc')
+    assert MediaLink.from_url('yt:abc') == MediaLink('yt', 'abc')
+    assert SubLink.from_url('yt:abc') == SubLink('zz', 'abc')
+    assert SubLink.from_url('dm:x123') == SubLink('dm', 'x123')
+
+
+def test_url_unknown_type_warning(monkeypatch, caplog):
+    monkeypatch.setattr(MediaLink, '_unknown_types', set())
+    link = MediaLink('xx', 'warning')
+    assert link.url == 'xx:warning'
+    assert link.url == 'xx:warning'
+    assert MediaLink('xx', 'other').url == 'xx:other'
+    warnings = [record for record in caplog.records
+                if 'unknown media type' in record.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_slots():
+    link = MediaLink('yt', 'abc')
+    assert not hasattr(link, '__dict__')
+    with pytest.raises(AttributeError):
+        link.unknown = 0